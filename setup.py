@@ -19,17 +19,16 @@ setup(
         "holiday",
         "calendar",
     ],
-    install_requires=["pandas","requests"],
-    extras_require={"dev": ["pytest","nose"]},
+    install_requires=["numpy","requests"],
+    extras_require={"dev": ["pandas","pytest","nose"]},
     package_data={"vacances_scolaires_france": ["data/data.csv"]},
-    python_requires=">=2.7, <4",
+    python_requires=">=3.7, <4",
     long_description=open("README.md", encoding="utf-8").read(),
     long_description_content_type="text/markdown",
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 2.7",
         "Programming Language :: Python :: 3",
     ],
 )
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
 import unittest
 import datetime
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
 
 from vacances_scolaires_france import SchoolHolidayDates
 from vacances_scolaires_france import UnsupportedYearException
@@ -182,3 +189,180 @@ class TestInit(unittest.TestCase):
         for k, v in res.items():
             self.assertEquals(sorted(v.keys()), self.EXPECTED_KEYS)
 
+
+    def test_is_holiday_for_zone_many(self):
+        d = SchoolHolidayDates()
+
+        dates = [
+            datetime.date(2009, 2, 7),
+            datetime.date(2009, 6, 7),
+            datetime.date(1990, 1, 1),
+            datetime.date(2026, 12, 31),
+        ]
+        self.assertEqual(d.is_holiday_for_zone_many(dates, "A"), [True, False, False, False])
+        self.assertEqual(d.is_holiday_for_zone_many(dates, "B"), [False, False, False, False])
+
+        with self.assertRaisesRegex(UnsupportedZoneException, "Unsupported zone: D"):
+            d.is_holiday_for_zone_many(dates, "D")
+
+    def test_holidays_between_dates(self):
+        d = SchoolHolidayDates()
+
+        res = d.holidays_between(datetime.date(2017, 10, 21), datetime.date(2017, 11, 5))
+        self.assertEqual(len(res), 16)
+        self.assertEqual(min(res), datetime.date(2017, 10, 21))
+        self.assertEqual(max(res), datetime.date(2017, 11, 5))
+        for k, v in res.items():
+            self.assertEqual(sorted(v.keys()), self.EXPECTED_KEYS)
+
+    def test_holiday_row(self):
+        d = SchoolHolidayDates()
+
+        row = d.holidays_for_year(2017)[datetime.date(2017, 12, 25)]
+        self.assertEqual(row.date, datetime.date(2017, 12, 25))
+        self.assertEqual(row["nom_vacances"], "Vacances de Noël")
+        self.assertTrue(row.vacances_zone_a)
+        self.assertEqual(
+            dict(row),
+            {
+                "date": datetime.date(2017, 12, 25),
+                "vacances_zone_a": True,
+                "vacances_zone_b": True,
+                "vacances_zone_c": True,
+                "nom_vacances": "Vacances de Noël",
+            },
+        )
+
+        with self.assertRaises(KeyError):
+            row["foo"]
+
+    def test_is_holiday_many(self):
+        d = SchoolHolidayDates()
+
+        dates = [datetime.date(2017, 12, 25), datetime.date(2017, 12, 1)]
+        self.assertEqual(d.is_holiday_many(dates), [True, False])
+        self.assertEqual(d.is_holiday_many(pd.Series(dates)), [True, False])
+        self.assertEqual(d.is_holiday_many([]), [])
+
+        with self.assertRaisesRegex(UnsupportedYearException, "No data for year: 1985"):
+            d.is_holiday_many([datetime.date(2017, 12, 25), datetime.date(1985, 2, 7)])
+        with self.assertRaisesRegex(ValueError, "date should be a datetime.date"):
+            d.is_holiday_many([datetime.date(2017, 12, 25), "2017-12-25"])
+
+    def test_load_data_shared(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        file = os.path.join(tmp, "data.csv")
+        shutil.copy(SchoolHolidayDates.BASE_FILE, file)
+
+        d = SchoolHolidayDates(file=file)
+        shared = SchoolHolidayDates(file=file)
+        self.assertIs(shared.data, d.data)
+        self.assertEqual(os.listdir(tmp), ["data.csv"])
+
+        stat = os.stat(file)
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        reloaded = SchoolHolidayDates(file=file)
+        self.assertIsNot(reloaded.data, d.data)
+        self.assertEqual(reloaded.data, d.data)
+        self.assertEqual(reloaded.holidays_for_year(2018), d.holidays_for_year(2018))
+        self.assertTrue(reloaded.is_holiday_for_zone(datetime.date(2009, 2, 7), "A"))
+
+    def test_download(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        file = os.path.join(tmp, "data.csv")
+
+        def get(url, **kwargs):
+            response = mock.MagicMock()
+            response.__enter__.return_value = response
+            if kwargs["headers"].get("If-None-Match") == '"v1"':
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response.headers = {"ETag": '"v1"'}
+                response.raw = open(SchoolHolidayDates.BASE_FILE, "rb")
+                self.addCleanup(response.raw.close)
+            return response
+
+        with mock.patch("requests.get", side_effect=get) as m:
+            d = SchoolHolidayDates(download=True, file=file)
+            self.assertTrue(d.is_holiday(datetime.date(2017, 12, 25)))
+            self.assertEqual(m.call_args[1]["headers"], {})
+            self.assertTrue(m.call_args[1]["stream"])
+            with open(file + ".etag") as f:
+                self.assertEqual(f.read(), '"v1"')
+
+            mtime = os.stat(file).st_mtime_ns
+            SchoolHolidayDates(download=True, file=file)
+            self.assertEqual(m.call_args[1]["headers"], {"If-None-Match": '"v1"'})
+            self.assertEqual(os.stat(file).st_mtime_ns, mtime)
+
+    def test_datetime64_series(self):
+        d = SchoolHolidayDates()
+
+        dates = pd.Series(pd.to_datetime(["2009-02-07", "2009-06-07", "2017-12-25"]))
+        self.assertEqual(d.is_holiday_many(dates), [True, False, True])
+        self.assertEqual(d.is_holiday_for_zone_many(dates, "A"), [True, False, True])
+        self.assertEqual(d.is_holiday_for_zone_many(dates, "B"), [False, False, True])
+        self.assertEqual(d.is_holiday_many(dates.iloc[:0]), [])
+
+        with self.assertRaisesRegex(UnsupportedYearException, "No data for year: 1985"):
+            d.is_holiday_many(pd.Series(pd.to_datetime(["2009-02-07", "1985-02-07"])))
+        with self.assertRaisesRegex(ValueError, "date should be a datetime.date"):
+            d.is_holiday_many(pd.Series(pd.to_datetime(["2009-02-07", None])))
+        with self.assertRaisesRegex(UnsupportedZoneException, "Unsupported zone: D"):
+            d.is_holiday_for_zone_many(dates, "D")
+
+    def test_is_holiday_array(self):
+        d = SchoolHolidayDates()
+
+        ordinals = np.array(
+            [
+                datetime.date(2009, 2, 7).toordinal(),
+                datetime.date(2009, 6, 7).toordinal(),
+                datetime.date(2017, 12, 25).toordinal(),
+            ]
+        )
+        res = d.is_holiday_array(ordinals)
+        self.assertIsInstance(res, np.ndarray)
+        self.assertEqual(res.tolist(), [True, False, True])
+        self.assertEqual(d.is_holiday_for_zone_array(ordinals, "A").tolist(), [True, False, True])
+        self.assertEqual(d.is_holiday_for_zone_array(ordinals, "B").tolist(), [False, False, True])
+        self.assertEqual(d.is_holiday_array([]).tolist(), [])
+        self.assertEqual(d.is_holiday_array([]).dtype, bool)
+        self.assertEqual(d.is_holiday_for_zone_array(np.array([]), "A").tolist(), [])
+
+        with self.assertRaisesRegex(UnsupportedYearException, "No data for year: 1985"):
+            d.is_holiday_array([datetime.date(1985, 2, 7).toordinal()])
+        with self.assertRaisesRegex(UnsupportedZoneException, "Unsupported zone: D"):
+            d.is_holiday_for_zone_array(ordinals, "D")
+        with self.assertRaisesRegex(ValueError, "ordinals should be an array of integers"):
+            d.is_holiday_array(["2017-12-25"])
+
+    def test_bulk_is_holiday_deprecated(self):
+        d = SchoolHolidayDates()
+
+        dates = [datetime.date(2017, 12, 25), datetime.date(2017, 12, 1)]
+        with self.assertWarnsRegex(DeprecationWarning, "use is_holiday_many"):
+            self.assertEqual(d.is_holiday(dates), [True, False])
+        with self.assertWarnsRegex(DeprecationWarning, "use is_holiday_for_zone_many"):
+            self.assertEqual(d.is_holiday_for_zone(pd.Series(dates), "A"), [True, False])
+
+        with self.assertRaisesRegex(ValueError, "date should be a datetime.date"):
+            d.is_holiday("2017-12-25")
+
+    def test_download_failure(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        file = os.path.join(tmp, "data.csv")
+
+        response = mock.MagicMock()
+        response.__enter__.return_value = response
+        response.status_code = 200
+        response.raw.read.side_effect = IOError("Connection reset")
+
+        with mock.patch("requests.get", return_value=response):
+            with self.assertRaisesRegex(IOError, "Connection reset"):
+                SchoolHolidayDates(download=True, file=file)
+        self.assertEqual(os.listdir(tmp), [])
@@ -1,9 +1,74 @@
 # -*- coding: utf-8 -*-
 import csv
 import os
+import sys
+import itertools
+import shutil
+import warnings
 import datetime
 import requests
-import pandas as pd
+from collections.abc import Mapping
+import numpy as np
+
+# Ordinal of the epoch of numpy datetime64 values
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_DATE_TYPE_ERROR = "date should be a datetime.date, a list of datetime.date, or a pandas Series of datetime.date"
+
+def _is_series(obj):
+    """Checks if an object is a pandas Series, without importing pandas.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        bool: Whether the object is a pandas Series.
+    """
+    # An object can only be a Series if its caller already imported pandas
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(obj, pd.Series)
+
+def _locate(query, ordinals):
+    """Locates query ordinals in a sorted ordinal array with a binary search.
+
+    Args:
+        query (np.ndarray): The ordinals to locate.
+        ordinals (np.ndarray): The sorted, non-empty ordinals to search.
+
+    Returns:
+        tuple: The candidate indices and a mask of ordinals found in the array.
+    """
+    indices = np.searchsorted(ordinals, query)
+    np.minimum(indices, len(ordinals) - 1, out=indices)
+    return indices, ordinals[indices] == query
+
+def _bulk_is_holiday(query, ordinals):
+    """Checks which query ordinals are present in a sorted ordinal array.
+
+    Args:
+        query (np.ndarray): The ordinals to check.
+        ordinals (np.ndarray): The sorted, non-empty ordinals of holidays.
+
+    Returns:
+        np.ndarray: A boolean mask of the query ordinals that are holidays.
+    """
+    return _locate(query, ordinals)[1]
+
+def _bulk_zone(query, ordinals, zone_mask, bit):
+    """Checks which query ordinals are holidays for a zone.
+
+    Args:
+        query (np.ndarray): The ordinals to check.
+        ordinals (np.ndarray): The sorted, non-empty ordinals of holidays.
+        zone_mask (np.ndarray): The zone bitmasks, parallel to ordinals.
+        bit (int): The bit of the zone in the bitmasks.
+
+    Returns:
+        np.ndarray: A boolean mask of the query ordinals that are holidays
+        for the zone.
+    """
+    indices, found = _locate(query, ordinals)
+    return found & ((zone_mask[indices] >> bit) & 1).astype(bool)
 
 class UnsupportedYearException(Exception):
     """Exception raised when the year is not supported."""
@@ -17,9 +82,55 @@ class UnsupportedHolidayException(Exception):
     """Exception raised when the holiday name is not supported."""
     pass
 
+class HolidayRow(Mapping):
+    """A holiday date with its holiday name and the zones on holiday.
+
+    Fields are available as attributes and, for compatibility, as a read-only
+    mapping keyed by the column names of the data file.
+    """
+    __slots__ = (
+        "date",
+        "vacances_zone_a",
+        "vacances_zone_b",
+        "vacances_zone_c",
+        "nom_vacances",
+    )
+
+    def __init__(self, date, vacances_zone_a, vacances_zone_b, vacances_zone_c, nom_vacances):
+        """Initializes the HolidayRow object.
+
+        Args:
+            date (datetime.date): The holiday date.
+            vacances_zone_a (bool): Whether zone A is on holiday.
+            vacances_zone_b (bool): Whether zone B is on holiday.
+            vacances_zone_c (bool): Whether zone C is on holiday.
+            nom_vacances (str): The name of the holiday.
+        """
+        self.date = date
+        self.vacances_zone_a = vacances_zone_a
+        self.vacances_zone_b = vacances_zone_b
+        self.vacances_zone_c = vacances_zone_c
+        self.nom_vacances = nom_vacances
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return "HolidayRow(" + ", ".join(k + "=" + repr(v) for k, v in self.items()) + ")"
+
 class SchoolHolidayDates(object):
     """A class to manage French school holiday dates."""
     SUPPORTED_ZONES = ["A", "B", "C"]
+    # Bit of each zone in the zone bitmasks
+    _ZONE_BITS = {zone: bit for bit, zone in enumerate(SUPPORTED_ZONES)}
     SUPPORTED_HOLIDAY_NAMES = [
         "Vacances de Noël",
         "Vacances d'hiver",
@@ -30,6 +141,8 @@ class SchoolHolidayDates(object):
     ]
     STABLE_URL = "https://www.data.gouv.fr/fr/datasets/r/c3781037-dffb-4789-9af9-15a955336771"
     BASE_FILE = os.path.join(os.path.dirname(__file__), "data/data.csv")
+    # Parsed data by (class, data file path), with the modification time it was parsed at
+    _SHARED = {}
 
     def __init__(self, download=False, file=None):
         """Initializes the SchoolHolidayDates object.
@@ -41,8 +154,8 @@ class SchoolHolidayDates(object):
         super(SchoolHolidayDates, self).__init__()
         self.data = {}
         self.load_data(download, file)
-        self.min_year = min(self.data.keys()).year
-        self.max_year = max(self.data.keys()).year
+        self.min_year = self._dates[0].year
+        self.max_year = self._dates[-1].year
 
     def load_data(self, download=False, file=None):
         """Loads holiday data from a file or URL.
@@ -52,27 +165,129 @@ class SchoolHolidayDates(object):
             file (str): Path to a custom file with holiday data.
         """
         if download:
-            r = requests.get(SchoolHolidayDates.STABLE_URL, allow_redirects=True)
-            open(file, 'wb').write(r.content)
+            self._download(file)
         filename = file if file and os.path.isfile(file) else SchoolHolidayDates.BASE_FILE
 
-        with open(filename) as f:
-            reader = csv.DictReader(f)
+        self._restore(self._shared_data(filename))
+
+    def _download(self, file):
+        """Downloads the holiday data to a file.
+
+        The ETag of the downloaded data is stored next to the file, and the
+        download is skipped when the server reports the data as unchanged.
+
+        Args:
+            file (str): Path to write the holiday data to.
+        """
+        etag_file = file + ".etag"
+        headers = {}
+        if os.path.isfile(file) and os.path.isfile(etag_file):
+            with open(etag_file) as f:
+                headers["If-None-Match"] = f.read().strip()
+
+        with requests.get(
+            SchoolHolidayDates.STABLE_URL, allow_redirects=True, stream=True, headers=headers
+        ) as r:
+            if r.status_code == 304:
+                return
+            r.raise_for_status()
+            r.raw.decode_content = True
+            tmp = file + "." + str(os.getpid()) + ".tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    shutil.copyfileobj(r.raw, f, 1 << 20)
+                os.replace(tmp, file)
+            except BaseException:
+                # Do not leave a partial download behind
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            etag = r.headers.get("ETag")
+
+        if etag:
+            with open(etag_file, "w") as f:
+                f.write(etag)
+        elif os.path.isfile(etag_file):
+            os.remove(etag_file)
+
+    def _shared_data(self, filename):
+        """Gets parsed holiday data, shared by all instances loading the same file.
+
+        The parsed data is kept for the lifetime of the process and reused
+        until the modification time of the data file changes. It is shared
+        between instances and must not be modified.
+
+        Args:
+            filename (str): Path to the file with holiday data.
+
+        Returns:
+            tuple: The parsed holiday data, as returned by _parse_data.
+        """
+        key = (type(self), os.path.abspath(filename))
+        mtime_ns = os.stat(filename).st_mtime_ns
+        shared = SchoolHolidayDates._SHARED.get(key)
+        if shared is None or shared[0] != mtime_ns:
+            shared = (mtime_ns, self._parse_data(filename))
+            SchoolHolidayDates._SHARED[key] = shared
+        return shared[1]
+
+    def _parse_data(self, filename):
+        """Parses holiday data from a CSV file.
+
+        Args:
+            filename (str): Path to the file with holiday data.
+
+        Returns:
+            tuple: The holiday rows by date, followed by the parallel arrays
+            sorted by date used for range and bulk queries.
+        """
+        zone_keys = [self.zone_key(zone) for zone in self.SUPPORTED_ZONES]
+        data = {}
+        with open(filename, newline="") as f:
+            reader = csv.reader(f)
+            # Resolve column positions once, rows are then read as plain lists
+            header = next(reader)
+            i_date, i_name = header.index("date"), header.index("nom_vacances")
+            i_zones = [header.index(zone_key) for zone_key in zone_keys]
             for row in reader:
-                date = datetime.datetime.strptime(row["date"], "%Y-%m-%d").date()
-                row["date"] = date
+                zones = [row[i] == "True" for i in i_zones]
 
                 # Only append rows where at least 1 zone is on holiday
-                is_holiday = False
-                for zone in self.SUPPORTED_ZONES:
-                    zone_key = self.zone_key(zone)
-                    row[zone_key] = row[zone_key] == "True"
-                    is_holiday = is_holiday or row[zone_key]
-
-                if is_holiday:
-                    if len(row["nom_vacances"]) == 0:
+                if any(zones):
+                    date = datetime.date.fromisoformat(row[i_date])
+                    if len(row[i_name]) == 0:
                         raise ValueError("Holiday name not set for date: " + str(date))
-                    self.data[date] = row
+                    name = sys.intern(row[i_name])
+                    data[date] = HolidayRow(date, *zones, nom_vacances=name)
+
+        dates = sorted(data)
+        rows = [data[d] for d in dates]
+        ordinals = np.asarray([d.toordinal() for d in dates], dtype=np.int32)
+        zone_mask = np.zeros(len(dates), dtype=np.uint8)
+        for zone, key in zip(self.SUPPORTED_ZONES, zone_keys):
+            flags = np.asarray([getattr(data[d], key) for d in dates], dtype=np.uint8)
+            zone_mask |= flags << self._ZONE_BITS[zone]
+        year_bounds = {}
+        for i, d in enumerate(dates):
+            lo, _ = year_bounds.get(d.year, (i, i))
+            year_bounds[d.year] = (lo, i + 1)
+
+        return data, dates, rows, ordinals, zone_mask, year_bounds
+
+    def _restore(self, state):
+        """Sets the parsed holiday data on the instance.
+
+        Args:
+            state (tuple): The parsed holiday data, as returned by _parse_data.
+        """
+        (
+            self.data,
+            self._dates,
+            self._rows,
+            self._ordinals,
+            self._zone_mask,
+            self._year_bounds,
+        ) = state
 
     def zone_key(self, zone):
         """Generates a key for the zone.
@@ -93,11 +308,16 @@ class SchoolHolidayDates(object):
         Args:
             name (str): The name of the holiday.
 
+        Returns:
+            str: The interned holiday name, so that comparisons against loaded
+            rows short-circuit on identity.
+
         Raises:
             UnsupportedHolidayException: If the holiday name is not supported.
         """
         if name not in self.SUPPORTED_HOLIDAY_NAMES:
             raise UnsupportedHolidayException("Unknown holiday name: " + name)
+        return sys.intern(name)
 
     def check_date(self, date):
         """Checks if the date is within the supported range.
@@ -109,53 +329,192 @@ class SchoolHolidayDates(object):
             ValueError: If the date type is incorrect.
             UnsupportedYearException: If the year is not supported.
         """
-        if isinstance(date, list) or isinstance(date, pd.Series):
-            for d in date:
-                self.check_date(d)
+        ordinals = self._datetime64_ordinals(date)
+        if ordinals is not None:
+            self._check_ordinals(ordinals)
+            return
+        if isinstance(date, list) or _is_series(date):
+            if not all(map(isinstance, date, itertools.repeat(datetime.date))):
+                raise ValueError(_DATE_TYPE_ERROR)
+            if len(date) > 0:
+                years = [d.year for d in date]
+                self.check_year(min(years))
+                self.check_year(max(years))
         else:
             if not isinstance(date, datetime.date):
-                raise ValueError("date should be a datetime.date, a list of datetime.date, or a pandas Series of datetime.date")
-            if date.year < self.min_year or date.year > self.max_year:
-                raise UnsupportedYearException("No data for year: " + str(date.year))
+                raise ValueError(_DATE_TYPE_ERROR)
+            self.check_year(date.year)
+
+    def check_year(self, year):
+        """Checks if the year is within the supported range.
+
+        Args:
+            year (int): The year to check.
+
+        Raises:
+            UnsupportedYearException: If the year is not supported.
+        """
+        if year < self.min_year or year > self.max_year:
+            raise UnsupportedYearException("No data for year: " + str(year))
+
+    def _datetime64_ordinals(self, date):
+        """Converts a pandas Series of datetime64 values to ordinals in one pass.
+
+        Args:
+            date: The date or dates to convert.
+
+        Returns:
+            np.ndarray | None: The ordinals of the dates, or None if date is not
+            a pandas Series with a datetime64 dtype.
+
+        Raises:
+            ValueError: If the Series contains missing values.
+        """
+        if not _is_series(date) or not isinstance(date.dtype, np.dtype):
+            return None
+        if date.dtype.kind != "M":
+            return None
+
+        days = date.to_numpy().astype("datetime64[D]")
+        if np.isnat(days).any():
+            raise ValueError(_DATE_TYPE_ERROR)
+        return (days.astype(np.int64) + _EPOCH_ORDINAL).astype(np.int32)
+
+    def _check_ordinals(self, ordinals):
+        """Checks if dates given as ordinals are within the supported range.
+
+        Args:
+            ordinals (np.ndarray): The ordinals of the dates to check.
+
+        Raises:
+            ValueError: If the ordinals are not integers.
+            UnsupportedYearException: If a year is not supported.
+        """
+        # An empty list converts to a float array, there is nothing to check
+        if ordinals.size == 0:
+            return
+        if ordinals.dtype.kind not in "iu":
+            raise ValueError("ordinals should be an array of integers")
+        self.check_year(datetime.date.fromordinal(int(ordinals.min())).year)
+        self.check_year(datetime.date.fromordinal(int(ordinals.max())).year)
 
     def is_holiday(self, date):
         """Checks if a date is a holiday.
 
+        Passing a list or a pandas Series is deprecated, use is_holiday_many.
+
         Args:
-            date (datetime.date | list | pd.Series): The date or dates to check.
+            date (datetime.date): The date to check.
 
         Returns:
-            bool | list: Whether the date(s) are holidays.
+            bool: Whether the date is a holiday.
         """
-        self.check_date(date)
-        if isinstance(date, list) or isinstance(date, pd.Series):
-            return [d in self.data for d in date]
-        else:
+        if isinstance(date, datetime.date):
+            self.check_year(date.year)
             return date in self.data
+        if isinstance(date, list) or _is_series(date):
+            warnings.warn(
+                "Passing several dates to is_holiday is deprecated, use is_holiday_many",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            return self.is_holiday_many(date)
+        raise ValueError(_DATE_TYPE_ERROR)
+
+    def is_holiday_many(self, dates):
+        """Checks if dates are holidays.
+
+        Args:
+            dates (list | pd.Series): The dates to check.
+
+        Returns:
+            list: Whether each date is a holiday.
+        """
+        ordinals = self._datetime64_ordinals(dates)
+        if ordinals is not None:
+            return self.is_holiday_array(ordinals).tolist()
+
+        self.check_date(dates)
+        # Python dates hash in C, which beats converting them to ordinals
+        return list(map(self.data.__contains__, dates))
 
     def is_holiday_for_zone(self, date, zone):
         """Checks if a date is a holiday for a specific zone.
 
+        Passing a list or a pandas Series is deprecated, use
+        is_holiday_for_zone_many.
+
         Args:
-            date (datetime.date | list | pd.Series): The date or dates to check.
+            date (datetime.date): The date to check.
             zone (str): The zone to check for.
 
         Returns:
-            bool | list: Whether the date(s) are holidays for the specified zone.
+            bool: Whether the date is a holiday for the specified zone.
         """
-        self.check_date(date)
-        if isinstance(date, list) or isinstance(date, pd.Series):
-            results = []
-            for d in date:
-                if d not in self.data:
-                    results.append(False)
-                else:
-                    results.append(self.data[d][self.zone_key(zone)])
-            return results
-        else:
-            if date not in self.data:
-                return False
-            return self.data[date][self.zone_key(zone)]
+        if isinstance(date, datetime.date):
+            self.check_year(date.year)
+            zone_key = self.zone_key(zone)
+            row = self.data.get(date)
+            return row is not None and getattr(row, zone_key)
+        if isinstance(date, list) or _is_series(date):
+            warnings.warn(
+                "Passing several dates to is_holiday_for_zone is deprecated, "
+                "use is_holiday_for_zone_many",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            return self.is_holiday_for_zone_many(date, zone)
+        raise ValueError(_DATE_TYPE_ERROR)
+
+    def is_holiday_for_zone_many(self, dates, zone):
+        """Checks if dates are holidays for a specific zone.
+
+        Args:
+            dates (list | pd.Series): The dates to check.
+            zone (str): The zone to check for.
+
+        Returns:
+            list: Whether each date is a holiday for the specified zone.
+        """
+        ordinals = self._datetime64_ordinals(dates)
+        if ordinals is not None:
+            return self.is_holiday_for_zone_array(ordinals, zone).tolist()
+
+        self.check_date(dates)
+        zone_key = self.zone_key(zone)
+        rows = map(self.data.get, dates)
+        return [row is not None and getattr(row, zone_key) for row in rows]
+
+    def is_holiday_array(self, ordinals):
+        """Checks if dates given as ordinals are holidays.
+
+        Args:
+            ordinals (np.ndarray): The dates to check, as returned by
+                datetime.date.toordinal.
+
+        Returns:
+            np.ndarray: A boolean array of whether the dates are holidays.
+        """
+        ordinals = np.asarray(ordinals)
+        self._check_ordinals(ordinals)
+        return _bulk_is_holiday(ordinals, self._ordinals)
+
+    def is_holiday_for_zone_array(self, ordinals, zone):
+        """Checks if dates given as ordinals are holidays for a specific zone.
+
+        Args:
+            ordinals (np.ndarray): The dates to check, as returned by
+                datetime.date.toordinal.
+            zone (str): The zone to check for.
+
+        Returns:
+            np.ndarray: A boolean array of whether the dates are holidays for
+            the specified zone.
+        """
+        ordinals = np.asarray(ordinals)
+        self._check_ordinals(ordinals)
+        self.zone_key(zone)
+        return _bulk_zone(ordinals, self._ordinals, self._zone_mask, self._ZONE_BITS[zone])
 
     def holidays_for_year(self, year):
         """Gets all holidays for a specific year.
@@ -166,9 +525,39 @@ class SchoolHolidayDates(object):
         Returns:
             dict: A dictionary of holidays for the year.
         """
-        if year < self.min_year or year > self.max_year:
-            raise UnsupportedYearException("No data for year: " + str(year))
-        return {k: v for k, v in self.data.items() if k.year == year}
+        return dict(self._iter_year(year))
+
+    def _iter_year(self, year):
+        """Iterates over the holidays of a year, sorted by date.
+
+        The year is checked before this returns, not on first iteration.
+
+        Args:
+            year (int): The year to iterate holidays for.
+
+        Returns:
+            iterator: The (date, row) pairs of holidays for the year.
+
+        Raises:
+            UnsupportedYearException: If the year is not supported.
+        """
+        self.check_year(year)
+        lo, hi = self._year_bounds.get(year, (0, 0))
+        return self._iter_range(lo, hi)
+
+    def _iter_range(self, lo, hi):
+        """Iterates over holidays by their position in the sorted data.
+
+        Args:
+            lo (int): The position of the first holiday.
+            hi (int): The position after the last holiday.
+
+        Yields:
+            tuple: The date and row of each holiday.
+        """
+        dates, rows = self._dates, self._rows
+        for i in range(lo, hi):
+            yield dates[i], rows[i]
 
     def holiday_for_year_by_name(self, year, name):
         """Gets holidays for a specific year by name.
@@ -180,13 +569,9 @@ class SchoolHolidayDates(object):
         Returns:
             dict: A dictionary of holidays for the year with the specified name.
         """
-        self.check_name(name)
+        name = self.check_name(name)
 
-        return {
-            k: v
-            for k, v in self.holidays_for_year(year).items()
-            if v["nom_vacances"] == name
-        }
+        return {d: r for d, r in self._iter_year(year) if r.nom_vacances == name}
 
     def holidays_for_year_and_zone(self, year, zone):
         """Gets holidays for a specific year and zone.
@@ -198,11 +583,9 @@ class SchoolHolidayDates(object):
         Returns:
             dict: A dictionary of holidays for the year and zone.
         """
-        return {
-            k: v
-            for k, v in self.holidays_for_year(year).items()
-            if self.is_holiday_for_zone(k, zone)
-        }
+        holidays = self._iter_year(year)
+        zone_key = self.zone_key(zone)
+        return {d: r for d, r in holidays if getattr(r, zone_key)}
 
     def holidays_for_year_zone_and_name(self, year, zone, name):
         """Gets holidays for a specific year, zone, and name.
@@ -215,12 +598,14 @@ class SchoolHolidayDates(object):
         Returns:
             dict: A dictionary of holidays for the year, zone, and name.
         """
-        self.check_name(name)
+        name = self.check_name(name)
 
+        holidays = self._iter_year(year)
+        zone_key = self.zone_key(zone)
         return {
-            k: v
-            for k, v in self.holidays_for_year(year).items()
-            if self.is_holiday_for_zone(k, zone) and v["nom_vacances"] == name
+            d: r
+            for d, r in holidays
+            if getattr(r, zone_key) and r.nom_vacances == name
         }
 
     def holidays_between(self, start_date, end_date):
@@ -235,4 +620,6 @@ class SchoolHolidayDates(object):
         """
         self.check_date(start_date)
         self.check_date(end_date)
-        return {k: v for k, v in self.data.items() if start_date <= k <= end_date}
+        lo = np.searchsorted(self._ordinals, start_date.toordinal(), "left")
+        hi = np.searchsorted(self._ordinals, end_date.toordinal(), "right")
+        return dict(self._iter_range(lo, hi))